@@ -3,12 +3,15 @@ Transaction categorizer using AI
 """
 
 import logging
-from typing import Dict
+from typing import Dict, List
 from openai import AsyncOpenAI
 
 from ai.config import ai_config
 from ai.prompts import prompts
 from shared.constants import CATEGORIES
+from database.connection import get_db_connection
+from database.repositories.category_repo import CategoryRepository
+from database.category_cache import get_cached_category_ids, get_category_ids
 
 logger = logging.getLogger(__name__)
 
@@ -82,3 +85,29 @@ def _get_default_category(transaction_type: str) -> Dict:
         default = next(cat for cat in CATEGORIES if cat['name'] == 'Другие доходы')
     
     return {'name': default['name'], 'icon': default['icon']}
+
+
+async def resolve_category_ids(transactions: List[Dict]) -> None:
+    """
+    Add 'category_id' to each transaction (from cache; one DB query only for unknown names)
+    
+    If the lookup fails, category_id stays None and the category
+    is looked up by name when the transaction is saved.
+    
+    Args:
+        transactions: Transactions with 'category_name'
+    """
+    category_ids = get_cached_category_ids({t['category_name'] for t in transactions})
+    missing = [name for name, category_id in category_ids.items() if category_id is None]
+    
+    # Соединение из пула берём только если в кэше нет хотя бы одной категории
+    if missing:
+        try:
+            async with get_db_connection() as conn:
+                category_ids.update(await get_category_ids(missing, CategoryRepository(conn)))
+            
+        except Exception as e:
+            logger.error(f"Error resolving category IDs: {e}")
+    
+    for transaction in transactions:
+        transaction['category_id'] = category_ids.get(transaction['category_name'])
@@ -26,6 +26,10 @@ class AIConfig:
     # Timeouts
     TIMEOUT: int = 30  # seconds
     
+    # Concurrency limits for OpenAI calls
+    VISION_MAX_CONCURRENCY: int = settings.VISION_MAX_CONCURRENCY
+    TEXT_MAX_CONCURRENCY: int = settings.TEXT_MAX_CONCURRENCY
+    
     # Retry settings
     MAX_RETRIES: int = 3
     RETRY_DELAY: int = 2  # seconds
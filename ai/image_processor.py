@@ -3,78 +3,91 @@
 Image OCR processor for receipts using OpenAI Vision
 """
 
+import asyncio
 import logging
 import json
 import base64
+import hashlib
 from typing import Optional, Dict
 from openai import AsyncOpenAI
-from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import date, datetime
 
 from ai.config import ai_config
 from ai.prompts import prompts
-from ai.categorizer import categorize_transaction
+from ai.categorizer import categorize_transaction, resolve_category_ids
+from shared.cache import LRUCache
 
 logger = logging.getLogger(__name__)
 
+# Кэш распознанных чеков по SHA-256 содержимого изображения
+# (повторно отправленный чек не вызывает Vision API).
+# Хранится транзакция и дата из чека: дата транзакции пересчитывается при каждом
+# попадании, иначе чек без даты на следующий день получил бы вчерашнее "сегодня"
+_receipt_cache = LRUCache(maxsize=1024, ttl=24 * 60 * 60)
 
-async def process_receipt_image(image_path: str) -> Optional[Dict]:
+# Ограничение одновременных запросов к Vision API
+_vision_semaphore = asyncio.Semaphore(ai_config.VISION_MAX_CONCURRENCY)
+
+
+async def process_receipt_image(image_bytes: bytes) -> Optional[Dict]:
     """
     Process receipt image and extract transaction data
     
     Args:
-        image_path: Path to image file
+        image_bytes: Image bytes
         
     Returns:
         Transaction data dictionary or None
     """
     try:
-        logger.info(f"Processing receipt image: {image_path}")
-        
-        # Check file exists
-        file_path = Path(image_path)
-        if not file_path.exists():
-            logger.error(f"Image file not found: {image_path}")
-            return None
+        logger.info("Processing receipt image from memory")
+        file_size = len(image_bytes)
         
         # Check file size
-        file_size = file_path.stat().st_size
         if file_size > 20 * 1024 * 1024:  # 20MB limit
             logger.error(f"Image file too large: {file_size} bytes")
             return None
         
         logger.info(f"Image file size: {file_size} bytes")
         
-        # Read and encode image
-        with open(image_path, 'rb') as image_file:
-            image_data = base64.b64encode(image_file.read()).decode('utf-8')
+        # Check cache by content hash
+        digest = hashlib.sha256(image_bytes).hexdigest()
+        cached = _receipt_cache.get(digest)
+        if cached is not None:
+            logger.info(f"Receipt cache hit: {digest[:12]}")
+            cached_transaction, receipt_date = cached
+            return {**cached_transaction, 'date': _parse_receipt_date(receipt_date)}
+        
+        # Encode image
+        image_data = base64.b64encode(image_bytes).decode('utf-8')
         
         # Create prompt
         prompt = prompts.image_ocr_prompt()
         
-        # Call OpenAI Vision
-        async with AsyncOpenAI(api_key=ai_config.OPENAI_API_KEY) as client:
-            response = await client.chat.completions.create(
-                model=ai_config.VISION_MODEL,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": prompt
-                            },
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/jpeg;base64,{image_data}"
+        # Call OpenAI Vision (excess requests wait here instead of hitting rate limits)
+        async with _vision_semaphore:
+            async with AsyncOpenAI(api_key=ai_config.OPENAI_API_KEY) as client:
+                response = await client.chat.completions.create(
+                    model=ai_config.VISION_MODEL,
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": [
+                                {
+                                    "type": "text",
+                                    "text": prompt
+                                },
+                                {
+                                    "type": "image_url",
+                                    "image_url": {
+                                        "url": f"data:image/jpeg;base64,{image_data}"
+                                    }
                                 }
-                            }
-                        ]
-                    }
-                ],
-                max_tokens=ai_config.VISION_MAX_TOKENS
-            )
+                            ]
+                        }
+                    ],
+                    max_tokens=ai_config.VISION_MAX_TOKENS
+                )
         
         # Extract response
         result_text = response.choices[0].message.content
@@ -91,7 +104,9 @@ async def process_receipt_image(image_path: str) -> Optional[Dict]:
         transaction_data = await _receipt_to_transaction(receipt_data)
         
         if transaction_data:
+            await resolve_category_ids([transaction_data])
             logger.info(f"Successfully processed receipt: {transaction_data['amount']} ₽")
+            _receipt_cache.set(digest, (dict(transaction_data), receipt_data.get('date')))
         
         return transaction_data
         
@@ -135,6 +150,45 @@ def _parse_receipt_json(text: str) -> Optional[Dict]:
         return None
 
 
+def _parse_receipt_date(date_str: Optional[str]) -> date:
+    """
+    Get transaction date from receipt date string
+    (today if the date is missing, invalid, older than 30 days or in the future)
+    """
+    today = datetime.now().date()
+    
+    if not date_str:
+        logger.info("No date in receipt, using today")
+        return today
+    
+    try:
+        parsed_date = datetime.strptime(date_str, '%Y-%m-%d').date()
+    except ValueError:
+        logger.warning(f"Invalid date format: {date_str}, using today")
+        return today
+    
+    # ВАЛИДАЦИЯ: проверяем адекватность даты
+    days_difference = (today - parsed_date).days
+    
+    # Если дата старше 30 дней или в будущем - используем сегодня
+    if days_difference > 30:
+        logger.warning(
+            f"Receipt date {date_str} is {days_difference} days ago (too old). "
+            f"Using current date instead."
+        )
+        return today
+    if days_difference < 0:
+        logger.warning(
+            f"Receipt date {date_str} is in the future ({abs(days_difference)} days ahead). "
+            f"Using current date instead."
+        )
+        return today
+    
+    # Дата адекватная - используем её
+    logger.info(f"Using receipt date: {date_str}")
+    return parsed_date
+
+
 async def _receipt_to_transaction(receipt_data: Dict) -> Optional[Dict]:
     """
     Convert receipt data to transaction format
@@ -158,39 +212,7 @@ async def _receipt_to_transaction(receipt_data: Dict) -> Optional[Dict]:
         description = description[:200]  # Limit length
         
         # Parse and validate date
-        date_str = receipt_data.get('date')
-        transaction_date = datetime.now().date()  # Default to today
-        
-        if date_str:
-            try:
-                parsed_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-                
-                # ВАЛИДАЦИЯ: проверяем адекватность даты
-                days_difference = (datetime.now().date() - parsed_date).days
-                
-                # Если дата старше 30 дней или в будущем - используем сегодня
-                if days_difference > 30:
-                    logger.warning(
-                        f"Receipt date {date_str} is {days_difference} days ago (too old). "
-                        f"Using current date instead."
-                    )
-                    transaction_date = datetime.now().date()
-                elif days_difference < 0:
-                    logger.warning(
-                        f"Receipt date {date_str} is in the future ({abs(days_difference)} days ahead). "
-                        f"Using current date instead."
-                    )
-                    transaction_date = datetime.now().date()
-                else:
-                    # Дата адекватная - используем её
-                    transaction_date = parsed_date
-                    logger.info(f"Using receipt date: {date_str}")
-                    
-            except ValueError:
-                logger.warning(f"Invalid date format: {date_str}, using today")
-                transaction_date = datetime.now().date()
-        else:
-            logger.info("No date in receipt, using today")
+        transaction_date = _parse_receipt_date(receipt_data.get('date'))
         
         # Categorize
         category = await categorize_transaction(description, amount, 'expense')
@@ -213,26 +235,24 @@ async def _receipt_to_transaction(receipt_data: Dict) -> Optional[Dict]:
         return None
 
 
-async def download_photo_file(bot, file_id: str, destination: str) -> bool:
+async def download_photo_bytes(bot, file_id: str) -> Optional[bytes]:
     """
-    Download photo from Telegram
+    Download photo from Telegram into memory
     
     Args:
         bot: Telegram bot instance
         file_id: Telegram file ID
-        destination: Path where to save file
         
     Returns:
-        True if successful
+        Photo bytes or None on error
     """
     try:
         file = await bot.get_file(file_id)
         logger.info(f"Downloading photo: {file.file_path}, size: {file.file_size} bytes")
         
-        await bot.download_file(file.file_path, destination)
-        logger.info(f"Photo downloaded to {destination}")
-        return True
+        buffer = await bot.download_file(file.file_path)
+        return buffer.getvalue()
         
     except Exception as e:
         logger.error(f"Error downloading photo: {e}", exc_info=True)
-        return False
+        return None
@@ -12,7 +12,7 @@ import PyPDF2
 
 from ai.config import ai_config
 from ai.prompts import prompts
-from ai.categorizer import categorize_transaction
+from ai.categorizer import categorize_transaction, resolve_category_ids
 
 logger = logging.getLogger(__name__)
 
@@ -80,6 +80,9 @@ async def process_receipt_pdf(pdf_path: str) -> Optional[Dict]:
         # Convert to transaction format
         transaction_data = await _pdf_to_transaction(receipt_data)
         
+        if transaction_data:
+            await resolve_category_ids([transaction_data])
+        
         return transaction_data
         
     except Exception as e:
@@ -4,7 +4,7 @@ AI Prompts for different tasks
 """
 
 from typing import Dict
-from datetime import datetime
+from shared.utils import today_str
 
 
 class AIPrompts:
@@ -15,7 +15,7 @@ class AIPrompts:
         """
         Промпт для парсинга текста транзакции (поддерживает множественные транзакции)
         """
-        current_date = datetime.now().strftime("%Y-%m-%d")
+        current_date = today_str()
         
         return f"""Ты финансовый ассистент. Твоя задача - извлечь информацию о транзакциях из текста пользователя.
 
@@ -65,7 +65,8 @@ class AIPrompts:
         "amount": число,
         "category_name": "название категории",
         "description": "краткое описание",
-        "date": "YYYY-MM-DD"
+        "date": "YYYY-MM-DD",
+        "confidence": число от 0 до 1
     }}
 ]
 
@@ -73,26 +74,36 @@ class AIPrompts:
 
 Вход: "Потратил 500 на такси"
 Ответ: [
-    {{"type": "expense", "amount": 500, "category_name": "Транспорт", "description": "Такси", "date": "{current_date}"}}
+    {{"type": "expense", "amount": 500, "category_name": "Транспорт", "description": "Такси", "date": "{current_date}", "confidence": 0.95}}
 ]
 
 Вход: "Купил бензин за 2000 и кофе за 200"
 Ответ: [
-    {{"type": "expense", "amount": 2000, "category_name": "Топливо", "description": "Бензин", "date": "{current_date}"}},
-    {{"type": "expense", "amount": 200, "category_name": "Рестораны и кафе", "description": "Кофе", "date": "{current_date}"}}
+    {{"type": "expense", "amount": 2000, "category_name": "Топливо", "description": "Бензин", "date": "{current_date}", "confidence": 0.95}},
+    {{"type": "expense", "amount": 200, "category_name": "Рестораны и кафе", "description": "Кофе", "date": "{current_date}", "confidence": 0.95}}
 ]
 
 Вход: "Получил зарплату 50000 и фриланс 15000"
 Ответ: [
-    {{"type": "income", "amount": 50000, "category_name": "Зарплата", "description": "Зарплата", "date": "{current_date}"}},
-    {{"type": "income", "amount": 15000, "category_name": "Фриланс/Подработка", "description": "Фриланс", "date": "{current_date}"}}
+    {{"type": "income", "amount": 50000, "category_name": "Зарплата", "description": "Зарплата", "date": "{current_date}", "confidence": 0.95}},
+    {{"type": "income", "amount": 15000, "category_name": "Фриланс/Подработка", "description": "Фриланс", "date": "{current_date}", "confidence": 0.95}}
 ]
 
 Вход: "Продукты 1500, такси 300, кино 500"
 Ответ: [
-    {{"type": "expense", "amount": 1500, "category_name": "Продукты", "description": "Покупка продуктов", "date": "{current_date}"}},
-    {{"type": "expense", "amount": 300, "category_name": "Транспорт", "description": "Такси", "date": "{current_date}"}},
-    {{"type": "expense", "amount": 500, "category_name": "Развлечения", "description": "Кино", "date": "{current_date}"}}
+    {{"type": "expense", "amount": 1500, "category_name": "Продукты", "description": "Покупка продуктов", "date": "{current_date}", "confidence": 0.95}},
+    {{"type": "expense", "amount": 300, "category_name": "Транспорт", "description": "Такси", "date": "{current_date}", "confidence": 0.95}},
+    {{"type": "expense", "amount": 500, "category_name": "Развлечения", "description": "Кино", "date": "{current_date}", "confidence": 0.95}}
+]
+
+Вход: "Скинул Саше 3000"
+Ответ: [
+    {{"type": "expense", "amount": 3000, "category_name": "Прочее", "description": "Перевод Саше", "date": "{current_date}", "confidence": 0.5}}
+]
+
+Вход: "Вернули 700"
+Ответ: [
+    {{"type": "income", "amount": 700, "category_name": "Подарки/Возвраты", "description": "Возврат", "date": "{current_date}", "confidence": 0.7}}
 ]
 
 ВАЖНО:
@@ -100,6 +111,7 @@ class AIPrompts:
 - Если не можешь определить - верни пустой массив: []
 - Суммы всегда положительные числа
 - Дата в формате YYYY-MM-DD
+- confidence - твоя уверенность в распознавании (1 - всё указано явно, меньше - если сумма, тип или категория угаданы)
 - НЕ добавляй дополнительный текст, только JSON массив
 """
 
@@ -149,7 +161,7 @@ class AIPrompts:
         """
         Промпт для распознавания чека на фото
         """
-        current_date = datetime.now().strftime("%Y-%m-%d")
+        current_date = today_str()
         
         return f"""Ты обрабатываешь фото чека из магазина. 
 
@@ -187,7 +199,7 @@ class AIPrompts:
         """
         Промпт для парсинга PDF чека
         """
-        current_date = datetime.now().strftime("%Y-%m-%d")
+        current_date = today_str()
         
         return f"""Ты обрабатываешь PDF чек.
 
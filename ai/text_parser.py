@@ -2,20 +2,26 @@
 Text transaction parser using OpenAI GPT-5
 """
 
+import asyncio
 import logging
 import json
-from typing import List, Dict
+from typing import List, Dict, Optional
 from openai import AsyncOpenAI
-from datetime import datetime
+from datetime import datetime, date
 
 from ai.config import ai_config
 from ai.prompts import prompts
+from ai.categorizer import resolve_category_ids
 from shared.constants import CATEGORIES
+from shared.utils import today_str
 
 logger = logging.getLogger(__name__)
 
+# Ограничение одновременных запросов к GPT
+_text_semaphore = asyncio.Semaphore(ai_config.TEXT_MAX_CONCURRENCY)
 
-async def parse_transaction_text(text: str) -> List[Dict]:
+
+async def parse_transaction_text(text: str) -> Optional[List[Dict]]:
     """
     Parse transaction(s) from text using GPT-5
     
@@ -23,20 +29,22 @@ async def parse_transaction_text(text: str) -> List[Dict]:
         text: User's text message
         
     Returns:
-        List of transaction dictionaries (может быть пустым списком)
+        List of transaction dictionaries or None if nothing was parsed
         Each transaction:
         {
             'type': 'income' or 'expense',
             'amount': float,
             'category_name': str,
+            'category_id': int or None,
             'category_icon': str,
             'description': str,
-            'date': date object
+            'date': date object,
+            'confidence': float (0..1)
         }
     """
     if not text or len(text.strip()) < 3:
         logger.warning("Text too short for parsing")
-        return []
+        return None
     
     try:
         logger.info(f"Parsing transaction text: {text[:100]}...")
@@ -44,26 +52,27 @@ async def parse_transaction_text(text: str) -> List[Dict]:
         # Create prompt
         prompt = prompts.text_parser_prompt(text)
         
-        # Call OpenAI GPT-5
-        async with AsyncOpenAI(api_key=ai_config.OPENAI_API_KEY) as client:
-            response = await client.chat.completions.create(
-                model=ai_config.GPT_MODEL,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_completion_tokens=ai_config.MAX_TOKENS
-                # temperature removed - GPT-5 only supports default (1)
-            )
+        # Call OpenAI GPT-5 (excess requests wait here instead of hitting rate limits)
+        async with _text_semaphore:
+            async with AsyncOpenAI(api_key=ai_config.OPENAI_API_KEY) as client:
+                response = await client.chat.completions.create(
+                    model=ai_config.GPT_MODEL,
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    max_completion_tokens=ai_config.MAX_TOKENS
+                    # temperature removed - GPT-5 only supports default (1)
+                )
         
         # Extract result
         result_text = response.choices[0].message.content
         
         if not result_text:
             logger.error("Empty response from GPT-5")
-            return []
+            return None
         
         logger.info(f"GPT-5 response: {result_text[:300]}")
         
@@ -72,7 +81,7 @@ async def parse_transaction_text(text: str) -> List[Dict]:
         
         if not transactions_data:
             logger.error("Failed to parse JSON from GPT response")
-            return []
+            return None
         
         # Validate and enrich each transaction
         validated_transactions = []
@@ -88,16 +97,18 @@ async def parse_transaction_text(text: str) -> List[Dict]:
             else:
                 logger.warning(f"Failed to validate transaction {idx}: {transaction_data}")
         
-        if validated_transactions:
-            logger.info(f"Successfully parsed {len(validated_transactions)} transaction(s)")
-        else:
+        if not validated_transactions:
             logger.warning("No valid transactions found")
+            return None
+        
+        await resolve_category_ids(validated_transactions)
+        logger.info(f"Successfully parsed {len(validated_transactions)} transaction(s)")
         
         return validated_transactions
         
     except Exception as e:
         logger.error(f"Error parsing transaction text: {e}", exc_info=True)
-        return []
+        return None
 
 
 def _parse_json_response(text: str) -> List[Dict]:
@@ -198,22 +209,29 @@ def _validate_and_enrich(data: Dict) -> Dict | None:
                 category = next(cat for cat in CATEGORIES if cat['name'] == 'Другие доходы')
         
         # Parse date
-        date_str = data.get('date', datetime.now().strftime('%Y-%m-%d'))
+        today = date.today()
+        date_str = data.get('date', today_str())
         try:
             transaction_date = datetime.strptime(date_str, '%Y-%m-%d').date()
             
             # Валидация даты (не слишком старая, не в будущем)
-            days_diff = (datetime.now().date() - transaction_date).days
+            days_diff = (today - transaction_date).days
             if days_diff > 365:
                 logger.warning(f"Date too old ({date_str}), using today")
-                transaction_date = datetime.now().date()
+                transaction_date = today
             elif days_diff < 0:
                 logger.warning(f"Date in future ({date_str}), using today")
-                transaction_date = datetime.now().date()
+                transaction_date = today
                 
-        except ValueError:
+        except (ValueError, TypeError):
             logger.warning(f"Invalid date format: {date_str}, using today")
-            transaction_date = datetime.now().date()
+            transaction_date = today
+        
+        # Parse confidence (0..1, по умолчанию 0 - требуется подтверждение)
+        try:
+            confidence = min(max(float(data.get('confidence', 0)), 0.0), 1.0)
+        except (ValueError, TypeError):
+            confidence = 0.0
         
         # Build result
         result = {
@@ -222,7 +240,8 @@ def _validate_and_enrich(data: Dict) -> Dict | None:
             'category_name': category['name'],
             'category_icon': category['icon'],
             'description': data.get('description', '')[:200],  # Limit description length
-            'date': transaction_date
+            'date': transaction_date,
+            'confidence': confidence
         }
         
         return result
@@ -0,0 +1,94 @@
+"""
+In-process cache of category name -> ID
+
+Categories are a small, rarely changed table, so IDs are kept in memory
+instead of being looked up on every transaction save.
+"""
+
+import logging
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+_category_ids: Dict[str, int] = {}
+
+
+async def preload_category_ids(repo) -> int:
+    """
+    Fill cache with all categories (called at startup)
+
+    Args:
+        repo: CategoryRepository instance
+
+    Returns:
+        Number of cached categories
+    """
+    categories = await repo.get_all(active_only=False)
+
+    _category_ids.clear()
+    _category_ids.update((category.name, category.id) for category in categories)
+
+    logger.info(f"Category cache loaded: {len(_category_ids)} categories")
+    return len(_category_ids)
+
+
+def get_cached_category_ids(names: Iterable[str]) -> Dict[str, Optional[int]]:
+    """
+    Get IDs for category names from cache only (no DB access)
+
+    Args:
+        names: Category names
+
+    Returns:
+        Dictionary name -> ID (None for names not in cache)
+    """
+    return {name: _category_ids.get(name) for name in names}
+
+
+async def get_category_ids(names: Iterable[str], repo) -> Dict[str, Optional[int]]:
+    """
+    Get IDs for category names (one DB query for names not in cache)
+
+    Args:
+        names: Category names
+        repo: CategoryRepository instance
+
+    Returns:
+        Dictionary name -> ID (None for unknown categories)
+    """
+    names = set(names)
+    missing = [name for name in names if name not in _category_ids]
+
+    if missing:
+        categories = await repo.get_by_names(missing)
+        _category_ids.update((category.name, category.id) for category in categories)
+
+    # Неизвестные названия не кэшируем - категория может появиться позже
+    return {name: _category_ids.get(name) for name in names}
+
+
+async def get_category_id(name: str, repo) -> Optional[int]:
+    """
+    Get ID for a single category name
+
+    Args:
+        name: Category name
+        repo: CategoryRepository instance
+
+    Returns:
+        Category ID or None
+    """
+    category_id = _category_ids.get(name)
+    if category_id is None:
+        category = await repo.get_by_name(name)
+        if category:
+            category_id = _category_ids[name] = category.id
+
+    return category_id
+
+
+def invalidate_category_cache() -> None:
+    """
+    Drop cached IDs (called when categories are created or changed)
+    """
+    _category_ids.clear()
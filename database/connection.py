@@ -30,11 +30,14 @@ async def init_database() -> None:
         
         _pool = await asyncpg.create_pool(
             dsn=settings.DATABASE_URL,
-            min_size=2,
-            max_size=10,
+            min_size=settings.DB_POOL_MIN_SIZE,
+            max_size=settings.DB_POOL_MAX_SIZE,
             command_timeout=60,
             max_queries=50000,
-            max_inactive_connection_lifetime=300
+            max_inactive_connection_lifetime=300,
+            # Prepared statements are cached per connection and never expire
+            statement_cache_size=1024,
+            max_cached_statement_lifetime=0
         )
         
         logger.info("Database connection pool initialized successfully")
@@ -7,6 +7,8 @@ from datetime import datetime, date
 from typing import Optional
 from decimal import Decimal
 
+from shared.utils import format_amount
+
 
 @dataclass
 class User:
@@ -63,7 +65,7 @@ class Transaction:
     @property
     def formatted_amount(self) -> str:
         """Get formatted amount string"""
-        return f"{self.amount:,.2f} ₽".replace(",", " ")
+        return format_amount(self.amount)
     
     def __str__(self) -> str:
         type_emoji = "💸" if self.type == "expense" else "💰"
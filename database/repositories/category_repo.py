@@ -7,9 +7,15 @@ from typing import Optional, List
 import asyncpg
 
 from database.models import Category
+from database.category_cache import invalidate_category_cache
 
 logger = logging.getLogger(__name__)
 
+# Hot lookups on the save path; constant SQL text lets asyncpg
+# reuse the prepared statement cached on each pooled connection
+_SELECT_CATEGORY_BY_NAME_SQL = "SELECT * FROM categories WHERE name = $1"
+_SELECT_CATEGORIES_BY_NAMES_SQL = "SELECT * FROM categories WHERE name = ANY($1::text[])"
+
 
 class CategoryRepository:
     """Repository for Category operations"""
@@ -50,10 +56,7 @@ class CategoryRepository:
             Category object or None
         """
         try:
-            row = await self.conn.fetchrow(
-                "SELECT * FROM categories WHERE name = $1",
-                name
-            )
+            row = await self.conn.fetchrow(_SELECT_CATEGORY_BY_NAME_SQL, name)
             
             return Category(**dict(row)) if row else None
             
@@ -61,6 +64,25 @@ class CategoryRepository:
             logger.error(f"Error getting category by name: {e}", exc_info=True)
             return None
     
+    async def get_by_names(self, names: List[str]) -> List[Category]:
+        """
+        Get categories by names (one query for several names)
+        
+        Args:
+            names: Category names
+            
+        Returns:
+            List of found Category objects
+        """
+        try:
+            rows = await self.conn.fetch(_SELECT_CATEGORIES_BY_NAMES_SQL, names)
+            
+            return [Category(**dict(row)) for row in rows]
+            
+        except Exception as e:
+            logger.error(f"Error getting categories by names: {e}", exc_info=True)
+            return []
+    
     async def get_all(self, category_type: Optional[str] = None, active_only: bool = True) -> List[Category]:
         """
         Get all categories
@@ -131,6 +153,7 @@ class CategoryRepository:
                 name, icon, category_type
             )
             
+            invalidate_category_cache()
             logger.info(f"Category created: {name}")
             return Category(**dict(row))
             
@@ -192,6 +215,7 @@ class CategoryRepository:
             row = await self.conn.fetchrow(query, *params)
             
             if row:
+                invalidate_category_cache()
                 logger.info(f"Category updated: id={category_id}")
                 return Category(**dict(row))
             
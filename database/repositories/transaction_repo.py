@@ -12,6 +12,18 @@ from database.models import Transaction, Category
 
 logger = logging.getLogger(__name__)
 
+# Constant SQL text lets asyncpg reuse the cached prepared statement
+_INSERT_TRANSACTION_SQL = """
+    INSERT INTO transactions (user_id, type, amount, category_id, description, transaction_date)
+    VALUES ($1, $2, $3, $4, $5, $6)
+    RETURNING id, user_id, type, amount, category_id, description, transaction_date, created_at, updated_at
+"""
+
+_INSERT_TRANSACTIONS_BULK_SQL = """
+    INSERT INTO transactions (user_id, type, amount, category_id, description, transaction_date)
+    VALUES ($1, $2, $3, $4, $5, $6)
+"""
+
 
 class TransactionRepository:
     """Repository for Transaction operations"""
@@ -47,11 +59,7 @@ class TransactionRepository:
                 transaction_date = date.today()
             
             row = await self.conn.fetchrow(
-                """
-                INSERT INTO transactions (user_id, type, amount, category_id, description, transaction_date)
-                VALUES ($1, $2, $3, $4, $5, $6)
-                RETURNING id, user_id, type, amount, category_id, description, transaction_date, created_at, updated_at
-                """,
+                _INSERT_TRANSACTION_SQL,
                 user_id, transaction_type, Decimal(str(amount)), category_id, description, transaction_date
             )
             
@@ -62,6 +70,42 @@ class TransactionRepository:
             logger.error(f"Error creating transaction: {e}", exc_info=True)
             raise
     
+    async def create_many(self, user_id: int, transactions: List[Dict]) -> int:
+        """
+        Create several transactions in one DB transaction
+        
+        Args:
+            user_id: User ID
+            transactions: Transaction dicts (type, amount, category_id, description, date)
+            
+        Returns:
+            Number of created transactions
+        """
+        try:
+            today = date.today()
+            args = [
+                (
+                    user_id,
+                    t['type'],
+                    Decimal(str(t['amount'])),
+                    t.get('category_id'),
+                    t.get('description'),
+                    t.get('date') or today
+                )
+                for t in transactions
+            ]
+            
+            # Все строки сохраняются целиком или не сохраняются вовсе
+            async with self.conn.transaction():
+                await self.conn.executemany(_INSERT_TRANSACTIONS_BULK_SQL, args)
+            
+            logger.info(f"Transactions created: user_id={user_id}, count={len(args)}")
+            return len(args)
+            
+        except Exception as e:
+            logger.error(f"Error creating transactions: {e}", exc_info=True)
+            raise
+    
     async def get_by_id(self, transaction_id: int) -> Optional[Transaction]:
         """
         Get transaction by ID
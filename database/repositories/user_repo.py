@@ -11,6 +11,31 @@ from database.models import User
 
 logger = logging.getLogger(__name__)
 
+# Get-or-create in one round-trip; profile fields are refreshed from Telegram.
+# The row is rewritten only if the profile actually changed (no trigger/WAL
+# write on every cache miss); otherwise the existing row is selected.
+# (xmax = 0) is true only for a freshly inserted row
+_UPSERT_USER_SQL = """
+    WITH upserted AS (
+        INSERT INTO users (telegram_user_id, username, first_name, last_name)
+        VALUES ($1, $2, $3, $4)
+        ON CONFLICT (telegram_user_id) DO UPDATE
+        SET username = EXCLUDED.username,
+            first_name = EXCLUDED.first_name,
+            last_name = EXCLUDED.last_name
+        WHERE (users.username, users.first_name, users.last_name)
+              IS DISTINCT FROM (EXCLUDED.username, EXCLUDED.first_name, EXCLUDED.last_name)
+        RETURNING id, telegram_user_id, username, first_name, last_name, created_at, updated_at,
+                  (xmax = 0) AS inserted
+    )
+    SELECT * FROM upserted
+    UNION ALL
+    SELECT id, telegram_user_id, username, first_name, last_name, created_at, updated_at,
+           FALSE AS inserted
+    FROM users
+    WHERE telegram_user_id = $1 AND NOT EXISTS (SELECT 1 FROM upserted)
+"""
+
 
 class UserRepository:
     """Repository for User operations"""
@@ -54,6 +79,45 @@ class UserRepository:
             logger.error(f"Error creating user: {e}", exc_info=True)
             raise
     
+    async def upsert(
+        self,
+        telegram_user_id: int,
+        username: Optional[str] = None,
+        first_name: Optional[str] = None,
+        last_name: Optional[str] = None
+    ) -> User:
+        """
+        Get user by Telegram ID, creating it if it doesn't exist (single query)
+        
+        Args:
+            telegram_user_id: Telegram user ID
+            username: Telegram username
+            first_name: User's first name
+            last_name: User's last name
+            
+        Returns:
+            Existing or created User object
+        """
+        try:
+            row = await self.conn.fetchrow(
+                _UPSERT_USER_SQL,
+                telegram_user_id, username, first_name, last_name
+            )
+            
+            if row is None:
+                # Строку вставил параллельный запрос после снимка нашего запроса
+                return await self.get_by_telegram_id(telegram_user_id)
+            
+            user_data = dict(row)
+            if user_data.pop('inserted'):
+                logger.info("User created: telegram_id=%s", telegram_user_id)
+            
+            return User(**user_data)
+            
+        except Exception as e:
+            logger.error(f"Error upserting user: {e}", exc_info=True)
+            raise
+    
     async def get_by_id(self, user_id: int) -> Optional[User]:
         """
         Get user by ID
@@ -0,0 +1,10 @@
+"""
+Service layer combining repository operations
+"""
+
+from .transaction_service import save_transaction, save_transactions_bulk
+
+__all__ = [
+    "save_transaction",
+    "save_transactions_bulk"
+]
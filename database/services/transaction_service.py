@@ -0,0 +1,71 @@
+"""
+Transaction saving service (shared by all bot handlers)
+"""
+
+import logging
+from typing import Dict, List
+from datetime import date
+import asyncpg
+
+from database.models import Transaction
+from database.repositories.transaction_repo import TransactionRepository
+from database.repositories.category_repo import CategoryRepository
+from database.category_cache import get_category_id, get_category_ids
+
+logger = logging.getLogger(__name__)
+
+
+async def save_transaction(conn: asyncpg.Connection, data: Dict, user_id: int) -> Transaction:
+    """
+    Save parsed transaction
+    
+    Args:
+        conn: Database connection
+        data: Parsed transaction (type, amount, category_name, category_id, description, date)
+        user_id: User ID
+        
+    Returns:
+        Created Transaction object
+    """
+    # Category ID is resolved at parse time;
+    # lookup by name only for data saved in FSM before that
+    category_id = data.get('category_id')
+    if category_id is None:
+        category_id = await get_category_id(data['category_name'], CategoryRepository(conn))
+    
+    transaction = await TransactionRepository(conn).create(
+        user_id=user_id,
+        transaction_type=data['type'],
+        amount=data['amount'],
+        category_id=category_id,
+        description=data['description'],
+        transaction_date=data.get('date') or date.today()
+    )
+    
+    logger.info("Transaction saved: %s %s ₽", data['type'], data['amount'])
+    return transaction
+
+
+async def save_transactions_bulk(conn: asyncpg.Connection, data_list: List[Dict], user_id: int) -> int:
+    """
+    Save several parsed transactions in one DB transaction
+    
+    Args:
+        conn: Database connection
+        data_list: Parsed transactions
+        user_id: User ID
+        
+    Returns:
+        Number of saved transactions (all or nothing)
+    """
+    # Категории, не найденные при разборе, берём из кэша (или одним запросом)
+    missing_names = {t['category_name'] for t in data_list if t.get('category_id') is None}
+    if missing_names:
+        name_to_id = await get_category_ids(missing_names, CategoryRepository(conn))
+        data_list = [
+            t if t.get('category_id') is not None
+            else {**t, 'category_id': name_to_id.get(t['category_name'])}
+            for t in data_list
+        ]
+    
+    return await TransactionRepository(conn).create_many(user_id, data_list)
@@ -21,6 +21,8 @@ class Settings:
     
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL", "")
+    DB_POOL_MIN_SIZE: int = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+    DB_POOL_MAX_SIZE: int = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
     
     # OpenAI
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
@@ -39,9 +41,19 @@ class Settings:
     MAX_TRANSACTIONS_PER_DAY: int = int(os.getenv("MAX_TRANSACTIONS_PER_DAY", "100"))
     MAX_AI_REQUESTS_PER_HOUR: int = int(os.getenv("MAX_AI_REQUESTS_PER_HOUR", "50"))
     
+    # Auto-save (одиночные транзакции с высокой уверенностью сохраняются без подтверждения)
+    AUTO_SAVE_MIN_CONFIDENCE: float = float(os.getenv("AUTO_SAVE_MIN_CONFIDENCE", "0.9"))
+    AUTO_SAVE_MAX_AMOUNT: float = float(os.getenv("AUTO_SAVE_MAX_AMOUNT", "5000"))
+    
     # Timeouts
     REQUEST_TIMEOUT: int = int(os.getenv("REQUEST_TIMEOUT", "30"))
     AI_TIMEOUT: int = int(os.getenv("AI_TIMEOUT", "30"))
+    # Сколько ждать обработки уже принятых апдейтов при остановке (Render даёт 30 сек)
+    SHUTDOWN_TIMEOUT: float = float(os.getenv("SHUTDOWN_TIMEOUT", "20"))
+    
+    # AI concurrency (лишние запросы ждут в очереди внутри процесса)
+    VISION_MAX_CONCURRENCY: int = int(os.getenv("VISION_MAX_CONCURRENCY", "8"))
+    TEXT_MAX_CONCURRENCY: int = int(os.getenv("TEXT_MAX_CONCURRENCY", "16"))
     
     def validate(self) -> bool:
         """
@@ -2,13 +2,19 @@
 Logging configuration
 """
 
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 from pathlib import Path
 
 from shared.config import settings
 
+# Background thread that writes log records to the real handlers
+_listener: Optional[QueueListener] = None
+
 
 def setup_logging(
     level: Optional[str] = None,
@@ -44,12 +50,15 @@ def setup_logging(
     
     # Remove existing handlers
     root_logger.handlers.clear()
+    _stop_listener()
+    
+    handlers = []
     
     # Console handler (stdout)
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(numeric_level)
     console_handler.setFormatter(console_formatter)
-    root_logger.addHandler(console_handler)
+    handlers.append(console_handler)
     
     # File handler (optional)
     if log_file:
@@ -59,7 +68,16 @@ def setup_logging(
         file_handler = logging.FileHandler(log_file, encoding='utf-8')
         file_handler.setLevel(numeric_level)
         file_handler.setFormatter(file_formatter)
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
+    
+    # QueueHandler still merges args and renders tracebacks in the calling thread
+    # (QueueHandler.prepare); only the stream/file writes move to the listener
+    # thread, so coroutines don't block on the stream lock or disk I/O
+    global _listener
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
     
     # Set levels for specific loggers
     logging.getLogger('asyncpg').setLevel(logging.WARNING)
@@ -71,6 +89,20 @@ def setup_logging(
     root_logger.info(f"Logging configured: level={level}, file={log_file or 'none'}")
 
 
+def _stop_listener() -> None:
+    """
+    Stop log listener thread, flushing queued records
+    """
+    global _listener
+    
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(_stop_listener)
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance
@@ -3,25 +3,33 @@ Utility functions
 """
 
 import re
-from typing import Optional, Tuple
+import orjson
+from typing import Optional, Tuple, Dict
 from datetime import datetime, date, timedelta
 from decimal import Decimal, InvalidOperation
 
 from shared.constants import CURRENCY_SYMBOL, DATE_FORMAT, DISPLAY_DATE_FORMAT
 
+# Разделитель тысяч: "1,500.00" -> "1 500.00" (translate - один проход без поиска подстроки)
+_COMMA_TO_SPACE = str.maketrans({",": " "})
 
-def format_amount(amount: float, with_currency: bool = True) -> str:
+# Отформатированная текущая дата по формату: {format: (date, string)}
+_today_cache: Dict[str, Tuple[date, str]] = {}
+
+
+def format_amount(amount: float, with_currency: bool = True, decimals: int = 2) -> str:
     """
     Format amount for display
     
     Args:
         amount: Amount to format
         with_currency: Include currency symbol
+        decimals: Number of decimal places
         
     Returns:
         Formatted string (e.g., "1 500.00 ₽")
     """
-    formatted = f"{amount:,.2f}".replace(",", " ")
+    formatted = f"{amount:,.{decimals}f}".translate(_COMMA_TO_SPACE)
     
     if with_currency:
         return f"{formatted} {CURRENCY_SYMBOL}"
@@ -29,6 +37,15 @@ def format_amount(amount: float, with_currency: bool = True) -> str:
     return formatted
 
 
+def json_dumps(value) -> str:
+    """
+    Serialize value to JSON string with orjson (в разы быстрее стандартного json)
+    
+    Drop-in replacement for json.dumps in aiohttp/aiogram `dumps` hooks.
+    """
+    return orjson.dumps(value).decode()
+
+
 def parse_amount(text: str) -> Optional[float]:
     """
     Parse amount from text
@@ -88,6 +105,28 @@ def validate_date(date_str: str, date_format: str = DISPLAY_DATE_FORMAT) -> Opti
         return None
 
 
+def today_str(date_format: str = DATE_FORMAT) -> str:
+    """
+    Get today's date as string
+    
+    The string is formatted once per day and cached until the date changes.
+    
+    Args:
+        date_format: Date format
+        
+    Returns:
+        Formatted date (e.g., "2025-01-31")
+    """
+    today = date.today()
+    cached = _today_cache.get(date_format)
+    
+    if cached is None or cached[0] != today:
+        cached = (today, today.strftime(date_format))
+        _today_cache[date_format] = cached
+    
+    return cached[1]
+
+
 def get_date_range(period: str = 'month') -> Tuple[date, date]:
     """
     Get date range for common periods
@@ -92,6 +92,10 @@ class BotMessages:
     TRANSACTIONS_CANCELLED = "❌ Транзакции отменены"
     TRANSACTION_EDIT = "✏️ Что хотите изменить?"
     
+    # Автосохранение одиночной транзакции
+    TRANSACTION_AUTO_SAVED = "✅ Сохранено: {type_emoji} <b>{amount} ₽</b> — {category_icon} {description}"
+    TRANSACTION_UNDONE = "↩️ Транзакция отменена и удалена"
+    
     ERROR = "❌ Произошла ошибка. Попробуйте еще раз."
     CANT_PARSE = """
 🤔 Не могу распознать транзакцию.
@@ -152,6 +156,7 @@ class BotButtons:
     SAVE_ALL = "✅ Сохранить все"
     EDIT = "✏️ Изменить"
     CANCEL = "❌ Отменить"
+    UNDO = "↩️ Отменить"
     
     EDIT_AMOUNT = "💰 Сумму"
     EDIT_CATEGORY = "📁 Категорию"
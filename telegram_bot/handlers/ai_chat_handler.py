@@ -17,8 +17,8 @@ from datetime import datetime
 from telegram_bot.config import BotMessages
 from telegram_bot.keyboards import ai_chat_keyboard, ai_end_keyboard
 from ai.agent import chat_with_agent, reset_agent_conversation
-from ai.voice_transcriber import transcribe_voice, download_voice_file
-from ai.image_processor import process_receipt_image, download_photo_file
+from ai.voice_transcriber import transcribe_audio, download_voice_bytes
+from ai.image_processor import process_receipt_image, download_photo_bytes
 from ai.pdf_processor import process_receipt_pdf, download_document_file
 from database.connection import get_db_connection
 from database.repositories.transaction_repo import TransactionRepository
@@ -305,44 +305,16 @@ async def handle_ai_voice(message: Message, state: FSMContext, db_user):
     """
     processing_msg = await message.answer("🎤 Обрабатываю голосовое сообщение...")
     
-    temp_file = None
-    temp_path = None
-    
     try:
-        # Create temp file
-        temp_file = tempfile.NamedTemporaryFile(
-            suffix='.ogg',
-            delete=False,
-            dir='/tmp'
-        )
-        temp_path = temp_file.name
-        temp_file.close()
-        
-        # Download voice file
-        success = await download_voice_file(
-            bot=message.bot,
-            file_id=message.voice.file_id,
-            destination=temp_path
-        )
+        # Download voice into memory (без временного файла)
+        voice_bytes = await download_voice_bytes(message.bot, message.voice.file_id)
         
-        if not success:
+        if voice_bytes is None:
             await processing_msg.edit_text("❌ Ошибка загрузки голосового сообщения")
             return
         
-        # Transcribe voice
-        from openai import AsyncOpenAI
-        from ai.config import ai_config
-        
         # Transcribe with Whisper
-        async with AsyncOpenAI(api_key=ai_config.OPENAI_API_KEY) as client:
-            with open(temp_path, 'rb') as audio_file:
-                transcript = await client.audio.transcriptions.create(
-                    model=ai_config.WHISPER_MODEL,
-                    file=audio_file,
-                    language="ru"
-                )
-        
-        transcribed_text = transcript.text
+        transcribed_text = await transcribe_audio(voice_bytes, filename='voice.ogg')
         logger.info(f"AI voice transcribed for user {db_user.id}: {transcribed_text}")
         
         if not transcribed_text or len(transcribed_text.strip()) < 3:
@@ -376,14 +348,6 @@ async def handle_ai_voice(message: Message, state: FSMContext, db_user):
     except Exception as e:
         logger.error(f"Error in AI voice handler: {e}", exc_info=True)
         await processing_msg.edit_text(BotMessages.AI_ERROR)
-    
-    finally:
-        # Cleanup temp file
-        if temp_path and os.path.exists(temp_path):
-            try:
-                os.unlink(temp_path)
-            except Exception as e:
-                logger.error(f"Error deleting temp file: {e}")
 
 
 # ==================== PHOTO HANDLER ====================
@@ -396,35 +360,22 @@ async def handle_ai_photo(message: Message, state: FSMContext, db_user):
     """
     processing_msg = await message.answer("📸 Обрабатываю фото...")
     
-    temp_file = None
-    temp_path = None
-    
     try:
         # Get largest photo
         photo = message.photo[-1]
         
-        # Create temp file
-        temp_file = tempfile.NamedTemporaryFile(
-            suffix='.jpg',
-            delete=False,
-            dir='/tmp'
-        )
-        temp_path = temp_file.name
-        temp_file.close()
-        
-        # Download photo
-        success = await download_photo_file(
+        # Download photo into memory
+        image_bytes = await download_photo_bytes(
             bot=message.bot,
-            file_id=photo.file_id,
-            destination=temp_path
+            file_id=photo.file_id
         )
         
-        if not success:
+        if image_bytes is None:
             await processing_msg.edit_text("❌ Ошибка загрузки фото")
             return
         
         # Process receipt
-        receipt_data = await process_receipt_image(temp_path)
+        receipt_data = await process_receipt_image(image_bytes)
         
         if not receipt_data:
             await processing_msg.edit_text(
@@ -474,14 +425,6 @@ async def handle_ai_photo(message: Message, state: FSMContext, db_user):
     except Exception as e:
         logger.error(f"Error in AI photo handler: {e}", exc_info=True)
         await processing_msg.edit_text(BotMessages.AI_ERROR)
-    
-    finally:
-        # Cleanup
-        if temp_path and os.path.exists(temp_path):
-            try:
-                os.unlink(temp_path)
-            except Exception as e:
-                logger.error(f"Error deleting temp file: {e}")
 
 
 # ==================== DOCUMENT (PDF) HANDLER ====================
@@ -12,7 +12,7 @@ from aiogram.fsm.context import FSMContext
 from telegram_bot.config import BotMessages
 from telegram_bot.keyboards import transaction_confirmation_keyboard
 from ai.pdf_processor import process_receipt_pdf, download_document_file
-from telegram_bot.handlers.text_handler import TransactionStates
+from telegram_bot.handlers.text_handler import TransactionStates, render_transaction_confirmation
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -107,18 +107,7 @@ async def handle_document_message(message: Message, state: FSMContext, db_user):
         )
         
         # Show confirmation
-        type_emoji = "💸"  # PDF чеки всегда расходы
-        type_name = "Расход"
-        
-        confirmation_text = BotMessages.TRANSACTION_CONFIRM.format(
-            type_emoji=type_emoji,
-            type_name=type_name,
-            amount=f"{transaction_data['amount']:,.2f}".replace(",", " "),
-            category_icon=transaction_data['category_icon'],
-            category_name=transaction_data['category_name'],
-            description=transaction_data['description'],
-            date=transaction_data['date'].strftime('%d.%m.%Y') if hasattr(transaction_data['date'], 'strftime') else str(transaction_data['date'])
-        )
+        confirmation_text = render_transaction_confirmation(transaction_data)
         
         await processing_msg.edit_text(
             confirmation_text,
@@ -8,6 +8,7 @@ from aiogram.filters import Command
 from aiogram.types import Message
 
 from telegram_bot.config import BotMessages
+from shared.utils import format_amount
 
 logger = logging.getLogger(__name__)
 router = Router()
@@ -72,9 +73,9 @@ async def cmd_stats(message: Message, db_user):
             
             text = BotMessages.STATS_MONTH.format(
                 month=month_names[now.month],
-                income=f"{stats['income']:,.0f}".replace(",", " "),
-                expenses=f"{stats['expenses']:,.0f}".replace(",", " "),
-                balance=f"{stats['balance']:,.0f}".replace(",", " "),
+                income=format_amount(stats['income'], with_currency=False, decimals=0),
+                expenses=format_amount(stats['expenses'], with_currency=False, decimals=0),
+                balance=format_amount(stats['balance'], with_currency=False, decimals=0),
                 count=stats['count']
             )
             
@@ -3,16 +3,14 @@ Photo handler
 """
 
 import logging
-import os
-import tempfile
 from aiogram import Router, F
 from aiogram.types import Message
 from aiogram.fsm.context import FSMContext
 
-from telegram_bot.config import BotMessages
+from telegram_bot.utils import ProcessingReply
 from telegram_bot.keyboards import transaction_confirmation_keyboard
-from ai.image_processor import process_receipt_image, download_photo_file
-from telegram_bot.handlers.text_handler import TransactionStates
+from ai.image_processor import process_receipt_image, download_photo_bytes
+from telegram_bot.handlers.text_handler import TransactionStates, render_transaction_confirmation
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -25,47 +23,36 @@ async def handle_photo_message(message: Message, state: FSMContext, db_user):
     Handle photo messages from user (receipts)
     Чеки обычно содержат одну транзакцию
     """
-    processing_msg = await message.answer(BotMessages.PROCESSING)
-    
-    temp_file = None
-    temp_path = None
+    # "Обрабатываю..." показывается только если обработка идёт дольше 0.5 сек
+    reply = ProcessingReply(message)
     
     try:
         # Get the largest photo (best quality)
         photo = message.photo[-1]  # Последнее фото = наибольшее разрешение
         
-        logger.info(
-            f"Photo from user {db_user.id}, "
-            f"size: {photo.width}x{photo.height}, "
-            f"file_size: {photo.file_size} bytes"
-        )
-        
-        # Create temp file for photo
-        temp_file = tempfile.NamedTemporaryFile(
-            suffix='.jpg',
-            delete=False,
-            dir='/tmp'
-        )
-        temp_path = temp_file.name
-        temp_file.close()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                f"Photo from user {db_user.id}, "
+                f"size: {photo.width}x{photo.height}, "
+                f"file_size: {photo.file_size} bytes"
+            )
         
-        # Download photo
-        success = await download_photo_file(
+        # Download photo into memory (без временного файла на диске)
+        image_bytes = await reply.run(download_photo_bytes(
             bot=message.bot,
-            file_id=photo.file_id,
-            destination=temp_path
-        )
+            file_id=photo.file_id
+        ))
         
-        if not success:
-            await processing_msg.edit_text("❌ Ошибка загрузки фото")
+        if image_bytes is None:
+            await reply.answer("❌ Ошибка загрузки фото")
             return
         
         # Process receipt image with Vision AI
         # Возвращает Optional[Dict] - одну транзакцию
-        transaction_data = await process_receipt_image(temp_path)
+        transaction_data = await reply.run(process_receipt_image(image_bytes))
         
         if transaction_data is None:
-            await processing_msg.edit_text(
+            await reply.answer(
                 "❌ Не удалось распознать чек на фото.\n\n"
                 "Попробуйте:\n"
                 "• Сделать фото чётче\n"
@@ -87,20 +74,9 @@ async def handle_photo_message(message: Message, state: FSMContext, db_user):
         )
         
         # Show confirmation
-        type_emoji = "💸"  # Чеки всегда расходы
-        type_name = "Расход"
+        confirmation_text = render_transaction_confirmation(transaction_data)
         
-        confirmation_text = BotMessages.TRANSACTION_CONFIRM.format(
-            type_emoji=type_emoji,
-            type_name=type_name,
-            amount=f"{transaction_data['amount']:,.2f}".replace(",", " "),
-            category_icon=transaction_data['category_icon'],
-            category_name=transaction_data['category_name'],
-            description=transaction_data['description'],
-            date=transaction_data['date'].strftime('%d.%m.%Y') if hasattr(transaction_data['date'], 'strftime') else str(transaction_data['date'])
-        )
-        
-        await processing_msg.edit_text(
+        await reply.answer(
             confirmation_text,
             reply_markup=transaction_confirmation_keyboard()
         )
@@ -112,19 +88,10 @@ async def handle_photo_message(message: Message, state: FSMContext, db_user):
         
     except Exception as e:
         logger.error(f"Error handling photo message: {e}", exc_info=True)
-        await processing_msg.edit_text(
+        await reply.answer(
             "❌ Произошла ошибка при обработке фото.\n\n"
             "Попробуйте:\n"
             "• Отправить другое фото\n"
             "• Отправить PDF чека\n"
             "• Написать транзакцию текстом"
         )
-    
-    finally:
-        # Cleanup temp file
-        if temp_path and os.path.exists(temp_path):
-            try:
-                os.unlink(temp_path)
-                logger.info(f"Temp photo file deleted: {temp_path}")
-            except Exception as e:
-                logger.error(f"Error deleting temp photo file: {e}")
@@ -2,23 +2,95 @@
 Text message handler
 """
 
+import asyncio
 import logging
+import asyncpg
+from typing import List, Optional, Tuple
 from aiogram import Router, F
 from aiogram.types import Message, CallbackQuery
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 
 from telegram_bot.config import BotMessages
-from telegram_bot.keyboards import transaction_confirmation_keyboard, multiple_transactions_confirmation_keyboard
+from telegram_bot.utils import ProcessingReply
+from telegram_bot.keyboards import (
+    transaction_confirmation_keyboard,
+    multiple_transactions_confirmation_keyboard,
+    transaction_undo_keyboard
+)
 from ai.text_parser import parse_transaction_text
 from database.repositories.transaction_repo import TransactionRepository
-from database.repositories.category_repo import CategoryRepository
+from database.services import transaction_service
 from database.connection import get_db_connection
-from datetime import datetime
+from shared.config import settings
+from shared.utils import format_amount
 
 logger = logging.getLogger(__name__)
 router = Router()
 
+# Эмодзи и название для каждого типа транзакции
+_TYPE_META = {
+    'expense': ('💸', 'Расход'),
+    'income': ('💰', 'Доход'),
+}
+
+
+def render_transaction_confirmation(transaction_data: dict) -> str:
+    """
+    Render confirmation text for single transaction
+    (используется обработчиками текста, голоса, фото и PDF)
+    """
+    type_emoji, type_name = _TYPE_META[transaction_data['type']]
+    
+    return BotMessages.TRANSACTION_CONFIRM.format(
+        type_emoji=type_emoji,
+        type_name=type_name,
+        amount=format_amount(transaction_data['amount'], with_currency=False),
+        category_icon=transaction_data['category_icon'],
+        category_name=transaction_data['category_name'],
+        description=transaction_data['description'],
+        date=transaction_data['date'].strftime('%d.%m.%Y')
+    )
+
+
+def render_multiple_transactions_confirmation(transactions: List[dict]) -> str:
+    """
+    Render confirmation text for several transactions
+    (используется обработчиками текста и голоса)
+    """
+    # Формируем список транзакций и считаем общие суммы за один проход
+    transactions_list = []
+    total_expenses = 0.0
+    total_income = 0.0
+    for idx, transaction_data in enumerate(transactions, 1):
+        transaction_type = transaction_data['type']
+        amount = transaction_data['amount']
+        
+        if transaction_type == 'expense':
+            total_expenses += amount
+        else:
+            total_income += amount
+        
+        transactions_list.append(
+            f"{idx}. {_TYPE_META[transaction_type][0]} {transaction_data['category_icon']} "
+            f"<b>{transaction_data['description']}</b> - "
+            f"{format_amount(amount, with_currency=False, decimals=0)} ₽"
+        )
+    
+    totals_parts = []
+    if total_expenses > 0:
+        totals_parts.append(f"💸 Расходы: {format_amount(total_expenses, decimals=0)}")
+    if total_income > 0:
+        totals_parts.append(f"💰 Доходы: {format_amount(total_income, decimals=0)}")
+    
+    totals_text = "\n".join(totals_parts)
+    
+    return BotMessages.MULTIPLE_TRANSACTIONS_CONFIRM.format(
+        count=len(transactions),
+        transactions_list="\n".join(transactions_list),
+        totals=totals_text
+    )
+
 
 class TransactionStates(StatesGroup):
     """States for transaction creation"""
@@ -27,82 +99,130 @@ class TransactionStates(StatesGroup):
     editing = State()
 
 
-async def _save_transaction_to_db(transaction_data: dict, user_id: int) -> bool:
+async def _save_transaction_to_db(transaction_data: dict, user_id: int) -> Optional[int]:
     """
     Вспомогательная функция для сохранения транзакции в БД
     
     Returns:
-        True если успешно сохранено, False в случае ошибки
+        ID сохранённой транзакции или None в случае ошибки
     """
     try:
         async with get_db_connection() as conn:
-            transaction_repo = TransactionRepository(conn)
-            category_repo = CategoryRepository(conn)
-            
-            # Get category ID
-            category = await category_repo.get_by_name(transaction_data['category_name'])
-            
-            # Create transaction
-            await transaction_repo.create(
-                user_id=user_id,
-                transaction_type=transaction_data['type'],
-                amount=transaction_data['amount'],
-                category_id=category.id if category else None,
-                description=transaction_data['description'],
-                transaction_date=transaction_data.get('date', datetime.now().date())
-            )
+            transaction = await transaction_service.save_transaction(conn, transaction_data, user_id)
+            return transaction.id
             
-            logger.info(f"Transaction saved: {transaction_data['type']} {transaction_data['amount']} ₽")
-            return True
+    except Exception as e:
+        logger.error("Error saving transaction to DB: %s", e, exc_info=True)
+        return None
+
+
+async def _save_transactions_bulk(transactions: List[dict], user_id: int) -> Tuple[int, int]:
+    """
+    Save several transactions using one connection and one DB transaction
+    (falls back to concurrent single saves if the database rejected the batch)
+    
+    Returns:
+        (saved_count, failed_count)
+    """
+    saved_count = None
+    try:
+        async with get_db_connection() as conn:
+            saved_count = await transaction_service.save_transactions_bulk(conn, transactions, user_id)
+        return saved_count, len(transactions) - saved_count
             
     except Exception as e:
-        logger.error(f"Error saving transaction to DB: {e}", exc_info=True)
-        return False
+        logger.error("Error saving transactions to DB: %s", e, exc_info=True)
+        
+        if saved_count is not None:
+            # Транзакция уже закоммичена, ошибка при возврате соединения в пул
+            return saved_count, len(transactions) - saved_count
+        
+        if not isinstance(e, asyncpg.PostgresError):
+            # Обрыв соединения или таймаут: неизвестно, прошёл ли COMMIT,
+            # повторная вставка могла бы задублировать транзакции
+            return 0, len(transactions)
+    
+    # БД отклонила пакет (все строки откатились) - сохраняем по одной,
+    # параллельно на разных соединениях пула, чтобы сохранить хотя бы корректные
+    results = await asyncio.gather(
+        *(_save_transaction_to_db(t, user_id) for t in transactions),
+        return_exceptions=True
+    )
+    saved_count = sum(1 for r in results if isinstance(r, int))
+    return saved_count, len(results) - saved_count
+
+
+def _can_auto_save(transaction_data: dict) -> bool:
+    """
+    Check if transaction can be saved without confirmation
+    (высокая уверенность AI и небольшая сумма)
+    """
+    return (
+        transaction_data.get('confidence', 0) >= settings.AUTO_SAVE_MIN_CONFIDENCE
+        and transaction_data['amount'] <= settings.AUTO_SAVE_MAX_AMOUNT
+    )
+
+
+def _is_plain_text(message: Message) -> bool:
+    """
+    Filter for plain text messages (не команды)
+    """
+    return bool(message.text) and not message.text.startswith('/')
 
 
-@router.message(F.text & ~F.text.startswith('/'))
+@router.message(_is_plain_text)
 async def handle_text_message(message: Message, state: FSMContext, db_user):
     """
     Handle text messages from user
     Поддерживает как одиночные, так и множественные транзакции
     """
-    processing_msg = await message.answer(BotMessages.PROCESSING)
+    user_id = db_user.id
+    
+    # "Обрабатываю..." показывается только если обработка идёт дольше 0.5 сек
+    reply = ProcessingReply(message)
     
     try:
         # Parse transaction(s) with AI - теперь возвращает список
-        transactions = await parse_transaction_text(message.text)
+        transactions = await reply.run(parse_transaction_text(message.text))
         
-        # Проверка: если пустой список или None
-        if not transactions or len(transactions) == 0:
-            await processing_msg.edit_text(BotMessages.CANT_PARSE)
+        # Парсер возвращает None, если ничего не распознано
+        if not transactions:
+            await reply.answer(BotMessages.CANT_PARSE)
             return
         
         # ========== ОДНА ТРАНЗАКЦИЯ - показываем подтверждение ==========
         if len(transactions) == 1:
             transaction_data = transactions[0]
             
+            # Уверенно распознанную транзакцию сохраняем сразу (с кнопкой отмены)
+            if _can_auto_save(transaction_data):
+                transaction_id = await reply.run(_save_transaction_to_db(transaction_data, user_id))
+                
+                if transaction_id is not None:
+                    await reply.answer(
+                        BotMessages.TRANSACTION_AUTO_SAVED.format(
+                            type_emoji=_TYPE_META[transaction_data['type']][0],
+                            amount=format_amount(transaction_data['amount'], with_currency=False),
+                            category_icon=transaction_data['category_icon'],
+                            description=transaction_data['description']
+                        ),
+                        reply_markup=transaction_undo_keyboard(transaction_id)
+                    )
+                    return
+                
+                # Не удалось сохранить - показываем обычное подтверждение
+            
             # Save to state
             await state.set_state(TransactionStates.waiting_confirmation)
             await state.update_data(
                 transaction=transaction_data,
-                user_id=db_user.id
+                user_id=user_id
             )
             
             # Show confirmation
-            type_emoji = "💸" if transaction_data['type'] == 'expense' else "💰"
-            type_name = "Расход" if transaction_data['type'] == 'expense' else "Доход"
-            
-            confirmation_text = BotMessages.TRANSACTION_CONFIRM.format(
-                type_emoji=type_emoji,
-                type_name=type_name,
-                amount=f"{transaction_data['amount']:,.2f}".replace(",", " "),
-                category_icon=transaction_data['category_icon'],
-                category_name=transaction_data['category_name'],
-                description=transaction_data['description'],
-                date=transaction_data['date'].strftime('%d.%m.%Y') if hasattr(transaction_data['date'], 'strftime') else str(transaction_data['date'])
-            )
+            confirmation_text = render_transaction_confirmation(transaction_data)
             
-            await processing_msg.edit_text(
+            await reply.answer(
                 confirmation_text,
                 reply_markup=transaction_confirmation_keyboard()
             )
@@ -113,52 +233,24 @@ async def handle_text_message(message: Message, state: FSMContext, db_user):
             await state.set_state(TransactionStates.waiting_multiple_confirmation)
             await state.update_data(
                 transactions=transactions,
-                user_id=db_user.id
+                user_id=user_id
             )
             
-            # Формируем список транзакций для отображения
-            transactions_list = []
-            for idx, transaction_data in enumerate(transactions, 1):
-                type_emoji = "💸" if transaction_data['type'] == 'expense' else "💰"
-                amount_formatted = f"{transaction_data['amount']:,.0f}".replace(",", " ")
-                
-                transactions_list.append(
-                    f"{idx}. {type_emoji} {transaction_data['category_icon']} "
-                    f"<b>{transaction_data['description']}</b> - {amount_formatted} ₽"
-                )
-            
-            # Считаем общие суммы
-            total_expenses = sum(t['amount'] for t in transactions if t['type'] == 'expense')
-            total_income = sum(t['amount'] for t in transactions if t['type'] == 'income')
-            
-            totals_parts = []
-            if total_expenses > 0:
-                totals_parts.append(f"💸 Расходы: {total_expenses:,.0f} ₽".replace(",", " "))
-            if total_income > 0:
-                totals_parts.append(f"💰 Доходы: {total_income:,.0f} ₽".replace(",", " "))
-            
-            totals_text = "\n".join(totals_parts)
-            
-            # Формируем итоговое сообщение
-            confirmation_text = BotMessages.MULTIPLE_TRANSACTIONS_CONFIRM.format(
-                count=len(transactions),
-                transactions_list="\n".join(transactions_list),
-                totals=totals_text
-            )
+            # Show confirmation
+            confirmation_text = render_multiple_transactions_confirmation(transactions)
             
-            await processing_msg.edit_text(
+            await reply.answer(
                 confirmation_text,
                 reply_markup=multiple_transactions_confirmation_keyboard()
             )
             
-            logger.info(f"Showing confirmation for {len(transactions)} transactions to user {db_user.id}")
+            logger.info("Showing confirmation for %s transactions to user %s", len(transactions), user_id)
         
     except Exception as e:
-        logger.error(f"Error handling text message: {e}", exc_info=True)
-        await processing_msg.edit_text(BotMessages.ERROR)
+        logger.error("Error handling text message: %s", e, exc_info=True)
+        await reply.answer(BotMessages.ERROR)
 
 
-@router.callback_query(F.data == "transaction_save")
 async def save_transaction(callback: CallbackQuery, state: FSMContext):
     """
     Save single transaction to database (для подтверждения одиночных транзакций)
@@ -173,9 +265,9 @@ async def save_transaction(callback: CallbackQuery, state: FSMContext):
     
     try:
         # Используем вспомогательную функцию
-        success = await _save_transaction_to_db(transaction, user_id)
+        transaction_id = await _save_transaction_to_db(transaction, user_id)
         
-        if success:
+        if transaction_id is not None:
             await callback.message.edit_text(BotMessages.TRANSACTION_SAVED)
             await state.clear()
             await callback.answer()
@@ -183,11 +275,10 @@ async def save_transaction(callback: CallbackQuery, state: FSMContext):
             await callback.answer("Ошибка при сохранении", show_alert=True)
         
     except Exception as e:
-        logger.error(f"Error in save_transaction callback: {e}", exc_info=True)
+        logger.error("Error in save_transaction callback: %s", e, exc_info=True)
         await callback.answer(BotMessages.ERROR, show_alert=True)
 
 
-@router.callback_query(F.data == "transactions_save_all")
 async def save_all_transactions(callback: CallbackQuery, state: FSMContext):
     """
     Save all transactions to database (для множественных транзакций)
@@ -201,18 +292,10 @@ async def save_all_transactions(callback: CallbackQuery, state: FSMContext):
         return
     
     try:
-        saved_count = 0
-        failed_count = 0
+        logger.info("Saving %s transactions for user %s", len(transactions), user_id)
         
-        logger.info(f"Saving {len(transactions)} transactions for user {user_id}")
-        
-        # Сохраняем каждую транзакцию
-        for transaction_data in transactions:
-            success = await _save_transaction_to_db(transaction_data, user_id)
-            if success:
-                saved_count += 1
-            else:
-                failed_count += 1
+        # Сохраняем все транзакции одним запросом
+        saved_count, failed_count = await _save_transactions_bulk(transactions, user_id)
         
         # Формируем итоговое сообщение
         if saved_count > 0:
@@ -231,11 +314,41 @@ async def save_all_transactions(callback: CallbackQuery, state: FSMContext):
             )
         
     except Exception as e:
-        logger.error(f"Error in save_all_transactions callback: {e}", exc_info=True)
+        logger.error("Error in save_all_transactions callback: %s", e, exc_info=True)
+        await callback.answer(BotMessages.ERROR, show_alert=True)
+
+
+@router.callback_query(F.data.startswith("transaction_undo:"))
+async def undo_transaction(callback: CallbackQuery, db_user):
+    """
+    Undo auto-saved transaction (удаляет транзакцию по ID)
+    """
+    try:
+        transaction_id = int(callback.data.split(":", 1)[1])
+        
+        async with get_db_connection() as conn:
+            transaction_repo = TransactionRepository(conn)
+            
+            # Проверяем что транзакция принадлежит пользователю
+            transaction = await transaction_repo.get_by_id(transaction_id)
+            if transaction is None or transaction.user_id != db_user.id:
+                await callback.answer("Транзакция не найдена", show_alert=True)
+                return
+            
+            deleted = await transaction_repo.delete(transaction_id)
+        
+        if not deleted:
+            await callback.answer(BotMessages.ERROR, show_alert=True)
+            return
+        
+        await callback.message.edit_text(BotMessages.TRANSACTION_UNDONE)
+        await callback.answer()
+        
+    except Exception as e:
+        logger.error("Error in undo_transaction callback: %s", e, exc_info=True)
         await callback.answer(BotMessages.ERROR, show_alert=True)
 
 
-@router.callback_query(F.data == "transaction_cancel")
 async def cancel_transaction(callback: CallbackQuery, state: FSMContext):
     """
     Cancel single transaction creation
@@ -245,7 +358,6 @@ async def cancel_transaction(callback: CallbackQuery, state: FSMContext):
     await callback.answer()
 
 
-@router.callback_query(F.data == "transactions_cancel_all")
 async def cancel_all_transactions(callback: CallbackQuery, state: FSMContext):
     """
     Cancel all transactions creation
@@ -255,9 +367,27 @@ async def cancel_all_transactions(callback: CallbackQuery, state: FSMContext):
     await callback.answer()
 
 
-@router.callback_query(F.data == "transaction_edit")
 async def edit_transaction(callback: CallbackQuery, state: FSMContext):
     """
     Edit transaction (for future implementation)
     """
     await callback.answer("Редактирование будет доступно в следующей версии", show_alert=True)
+
+
+# Кнопки подтверждения: один фильтр и поиск обработчика в словаре
+# вместо отдельного фильтра F.data == ... на каждую кнопку
+_CONFIRMATION_CALLBACKS = {
+    "transaction_save": save_transaction,
+    "transactions_save_all": save_all_transactions,
+    "transaction_cancel": cancel_transaction,
+    "transactions_cancel_all": cancel_all_transactions,
+    "transaction_edit": edit_transaction,
+}
+
+
+@router.callback_query(F.data.in_(frozenset(_CONFIRMATION_CALLBACKS)), flags={"skip_user": True})
+async def handle_confirmation_callback(callback: CallbackQuery, state: FSMContext):
+    """
+    Dispatch transaction confirmation buttons
+    """
+    await _CONFIRMATION_CALLBACKS[callback.data](callback, state)
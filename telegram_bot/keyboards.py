@@ -1,19 +1,27 @@
 """
 Keyboards for Telegram bot
+
+Keyboards without arguments are built once and reused (lru_cache):
+aiogram types are immutable, so one markup object can be sent many times.
 """
 
+from functools import lru_cache
 from aiogram.types import ReplyKeyboardMarkup, KeyboardButton, InlineKeyboardMarkup, InlineKeyboardButton, WebAppInfo
 from telegram_bot.config import BotButtons
 from shared.config import settings
 
+# Одна ссылка на Web App для всех клавиатур
+_WEB_APP_INFO = WebAppInfo(url=settings.TELEGRAM_WEBAPP_URL)
+
 
+@lru_cache(maxsize=1)
 def main_menu_keyboard() -> ReplyKeyboardMarkup:
     """
     Main menu keyboard with Web App button
     """
     keyboard = ReplyKeyboardMarkup(
         keyboard=[
-            [KeyboardButton(text=BotButtons.OPEN_APP, web_app=WebAppInfo(url=settings.TELEGRAM_WEBAPP_URL))]
+            [KeyboardButton(text=BotButtons.OPEN_APP, web_app=_WEB_APP_INFO)]
         ],
         resize_keyboard=True,
         persistent=True
@@ -21,9 +29,12 @@ def main_menu_keyboard() -> ReplyKeyboardMarkup:
     return keyboard
 
 
+@lru_cache(maxsize=1)
 def transaction_confirmation_keyboard() -> InlineKeyboardMarkup:
     """
     Keyboard for transaction confirmation (одиночная транзакция)
+
+    Markup is static, so it is built once and reused (aiogram types are immutable)
     """
     keyboard = InlineKeyboardMarkup(
         inline_keyboard=[
@@ -39,9 +50,12 @@ def transaction_confirmation_keyboard() -> InlineKeyboardMarkup:
     return keyboard
 
 
+@lru_cache(maxsize=1)
 def multiple_transactions_confirmation_keyboard() -> InlineKeyboardMarkup:
     """
     Keyboard for multiple transactions confirmation (множественные транзакции)
+
+    Markup is static, so it is built once and reused (aiogram types are immutable)
     """
     keyboard = InlineKeyboardMarkup(
         inline_keyboard=[
@@ -56,6 +70,21 @@ def multiple_transactions_confirmation_keyboard() -> InlineKeyboardMarkup:
     return keyboard
 
 
+def transaction_undo_keyboard(transaction_id: int) -> InlineKeyboardMarkup:
+    """
+    Keyboard for undoing an auto-saved transaction
+    """
+    keyboard = InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(text=BotButtons.UNDO, callback_data=f"transaction_undo:{transaction_id}")
+            ]
+        ]
+    )
+    return keyboard
+
+
+@lru_cache(maxsize=1)
 def transaction_edit_keyboard() -> InlineKeyboardMarkup:
     """
     Keyboard for editing transaction fields
@@ -78,6 +107,7 @@ def transaction_edit_keyboard() -> InlineKeyboardMarkup:
     return keyboard
 
 
+@lru_cache(maxsize=1)
 def open_app_keyboard() -> InlineKeyboardMarkup:
     """
     Keyboard with button to open Web App
@@ -87,7 +117,7 @@ def open_app_keyboard() -> InlineKeyboardMarkup:
             [
                 InlineKeyboardButton(
                     text=BotButtons.OPEN_APP,
-                    web_app=WebAppInfo(url=settings.TELEGRAM_WEBAPP_URL)
+                    web_app=_WEB_APP_INFO
                 )
             ]
         ]
@@ -95,9 +125,10 @@ def open_app_keyboard() -> InlineKeyboardMarkup:
     return keyboard
 
 
+@lru_cache(maxsize=1)
 def ai_chat_keyboard() -> InlineKeyboardMarkup:
     """
-    Keyboard with AI Assistant button
+    Keyboard with AI Assistant button (built once, reused)
     """
     keyboard = InlineKeyboardMarkup(
         inline_keyboard=[
@@ -112,6 +143,7 @@ def ai_chat_keyboard() -> InlineKeyboardMarkup:
     return keyboard
 
 
+@lru_cache(maxsize=1)
 def ai_end_keyboard() -> InlineKeyboardMarkup:
     """
     Keyboard with "End Dialog" button for AI responses
@@ -3,16 +3,31 @@ Telegram Bot Main Entry Point
 """
 
 import asyncio
+import hashlib
 import logging
 import os
+import signal
 from aiogram import Bot, Dispatcher
 from aiogram.enums import ParseMode
 from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.types import Update
 from aiohttp import web
+import orjson
+
+try:
+    # Faster event loop (libuv); optional - not available on Windows
+    import uvloop
+except ImportError:
+    uvloop = None
 
 from shared.config import settings, validate_config
 from shared.logger import setup_logging
-from database.connection import init_database, close_database, run_migrations
+from shared.utils import json_dumps
+from database.connection import init_database, close_database, run_migrations, get_db_connection
+from database.repositories.category_repo import CategoryRepository
+from database.category_cache import preload_category_ids
 from api_handlers import setup_api_routes
 
 # Import handlers
@@ -24,6 +39,17 @@ from telegram_bot.handlers.photo_handler import router as photo_router
 from telegram_bot.handlers.document_handler import router as document_router
 from telegram_bot.handlers.ai_chat_handler import router as ai_chat_router
 
+# Import keyboards (prebuilt at startup)
+from telegram_bot.keyboards import (
+    main_menu_keyboard,
+    transaction_confirmation_keyboard,
+    multiple_transactions_confirmation_keyboard,
+    transaction_edit_keyboard,
+    open_app_keyboard,
+    ai_chat_keyboard,
+    ai_end_keyboard
+)
+
 # Import middleware
 from telegram_bot.middleware import AuthMiddleware
 
@@ -34,14 +60,57 @@ from telegram_bot.webhook import on_startup, on_shutdown, setup_webhook_app
 setup_logging()
 logger = logging.getLogger(__name__)
 
+# Permanent redirect from root: browsers cache it and go straight to /webapp
+_WEBAPP_REDIRECT_HEADERS = {
+    'Location': '/webapp',
+    'Cache-Control': 'public, max-age=86400'
+}
+
+# Health check response never changes - serialize it once
+_HEALTH_BODY = orjson.dumps({
+    'status': 'ok',
+    'bot': 'running',
+    'webapp': 'available'
+})
+
+
+def create_bot_session() -> AiohttpSession:
+    """
+    Create HTTP session shared by all Bot API calls and file downloads
+    
+    Keeps idle connections to api.telegram.org open longer than the aiohttp default.
+    """
+    # Bot API requests/responses and webhook updates go through orjson
+    session = AiohttpSession(json_loads=orjson.loads, json_dumps=json_dumps)
+    # AiohttpSession builds its TCPConnector lazily from these kwargs.
+    # _connector_init is private - relies on the pinned aiogram 3.15 internals
+    session._connector_init.update(keepalive_timeout=75, enable_cleanup_closed=True)
+    return session
+
+
+def warm_up_bot_objects() -> None:
+    """
+    Build cached keyboards and run one Update validation before the first update
+    (иначе эту работу делает первый запрос пользователя)
+    """
+    for keyboard_factory in (
+        main_menu_keyboard,
+        transaction_confirmation_keyboard,
+        multiple_transactions_confirmation_keyboard,
+        transaction_edit_keyboard,
+        open_app_keyboard,
+        ai_chat_keyboard,
+        ai_end_keyboard
+    ):
+        keyboard_factory()
+    
+    Update.model_validate({"update_id": 0})
+
 
 def setup_static_routes(app):
     """
     Setup static file routes for webapp
     """
-    import os
-    from aiohttp import web
-    
     # Get webapp directory path
     webapp_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'webapp')
     
@@ -68,19 +137,48 @@ def setup_static_routes(app):
         except Exception as e:
             logger.error(f"Error listing directory: {e}")
     
+    # index.html читается один раз при старте (без stat/open на каждый запрос)
+    index_path = os.path.join(webapp_dir, 'index.html')
+    try:
+        with open(index_path, 'rb') as index_file:
+            index_bytes = index_file.read()
+        index_etag = f'"{hashlib.md5(index_bytes).hexdigest()}"'
+        logger.info(f"Loaded index.html from: {index_path} ({len(index_bytes)} bytes)")
+    except OSError as e:
+        logger.error(f"index.html not found: {index_path} ({e})")
+        index_bytes = None
+        index_etag = None
+    
+    index_headers = {
+        'ETag': index_etag or '',
+        'Cache-Control': 'public, max-age=60'
+    }
+    
     # Serve index.html at /webapp (БЕЗ trailing slash)
     async def serve_webapp_index(request):
-        index_path = os.path.join(webapp_dir, 'index.html')
-        if not os.path.exists(index_path):
-            logger.error(f"index.html not found: {index_path}")
+        if index_bytes is None:
             return web.Response(text='index.html not found', status=404)
-        logger.info(f"Serving index.html from: {index_path}")
-        return web.FileResponse(index_path)
+        
+        # Браузер уже имеет актуальную версию
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match and (
+            if_none_match.strip() == '*'
+            or index_etag in (tag.strip() for tag in if_none_match.split(','))
+        ):
+            return web.Response(status=304, headers=index_headers)
+        
+        return web.Response(
+            body=index_bytes,
+            content_type='text/html',
+            charset='utf-8',
+            headers=index_headers
+        )
     
     # Redirect from root to webapp
     async def redirect_to_webapp(request):
-        logger.info("Redirecting / to /webapp")
-        return web.HTTPFound('/webapp')
+        logger.debug("Redirecting / to /webapp")
+        # Response objects are single-use in aiohttp - only headers are shared
+        return web.Response(status=301, headers=_WEBAPP_REDIRECT_HEADERS)
     
     # Add routes in correct order
     app.router.add_get('/', redirect_to_webapp)
@@ -116,6 +214,16 @@ async def init_app():
         await init_database()
         logger.info("✓ Database initialized")
         
+        # Preload category IDs (transaction saves then skip the category lookup)
+        async with get_db_connection() as conn:
+            await preload_category_ids(CategoryRepository(conn))
+        logger.info("✓ Category cache loaded")
+        
+        # Pool connections (min_size) are opened by init_database;
+        # prebuild keyboards and aiogram models here
+        warm_up_bot_objects()
+        logger.info("✓ Bot objects warmed up")
+        
         # Run migrations - ЗАКОММЕНТИРОВАНО (запускать вручную или только первый раз)
         # ВАЖНО: Раскомментируйте только при первом деплое или при добавлении новых миграций
         # logger.info("Running database migrations...")
@@ -136,6 +244,8 @@ async def main():
     Main function to start the bot with webhook
     """
     bot = None
+    runner = None
+    stop_signals = []
     
     try:
         # Initialize app (database, etc.)
@@ -144,22 +254,27 @@ async def main():
         # Initialize bot and dispatcher
         bot = Bot(
             token=settings.TELEGRAM_BOT_TOKEN,
+            session=create_bot_session(),
             default=DefaultBotProperties(parse_mode=ParseMode.HTML)
         )
-        dp = Dispatcher()
+        # FSM storage in process memory: state data (transactions with date
+        # objects) is kept as Python objects, no JSON serialization per update
+        dp = Dispatcher(storage=MemoryStorage())
 
         # Register middleware
         dp.message.middleware(AuthMiddleware())
         dp.callback_query.middleware(AuthMiddleware())
 
-        # Register bot handlers
-        dp.include_router(start_router)
-        dp.include_router(help_router)
-        dp.include_router(ai_chat_router)
-        dp.include_router(text_router)
-        dp.include_router(voice_router)
-        dp.include_router(photo_router)
-        dp.include_router(document_router)
+        # Register bot handlers (порядок важен: ai_chat раньше text/voice/photo/document)
+        dp.include_routers(
+            start_router,
+            help_router,
+            ai_chat_router,
+            text_router,
+            voice_router,
+            photo_router,
+            document_router
+        )
 
         # Webhook configuration
         WEBHOOK_PATH = "/webhook"
@@ -190,11 +305,7 @@ async def main():
         
         # Health check endpoint
         async def health_check(request):
-            return web.json_response({
-                'status': 'ok',
-                'bot': 'running',
-                'webapp': 'available'
-            })
+            return web.Response(body=_HEALTH_BODY, content_type='application/json')
         
         app.router.add_get('/health', health_check)
         
@@ -214,8 +325,23 @@ async def main():
         logger.info("Bot is ready to accept requests!")
         logger.info("=" * 60)
         
-        # Keep running
-        await asyncio.Event().wait()
+        # Keep running until SIGTERM (Render stops containers with it) or SIGINT
+        stop_event = asyncio.Event()
+        
+        def request_stop(sig):
+            stop_signals.append(sig)
+            stop_event.set()
+        
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, request_stop, sig)
+            except NotImplementedError:
+                # Windows: only KeyboardInterrupt is available
+                pass
+        
+        await stop_event.wait()
+        logger.info(f"Received {stop_signals[0].name}, shutting down...")
         
     except KeyboardInterrupt:
         logger.info("Received interrupt signal, shutting down...")
@@ -226,8 +352,15 @@ async def main():
         # Cleanup
         logger.info("Cleaning up...")
         try:
+            # Stop accepting requests, wait for in-flight updates
+            # (see setup_webhook_app), then close the listening socket
+            if runner is not None:
+                await runner.cleanup()
             if bot is not None:
-                await on_shutdown(bot)
+                # SIGTERM comes on redeploy, when the new instance has already
+                # set the webhook - deleting it would cut the bot off
+                if signal.SIGTERM not in stop_signals:
+                    await on_shutdown(bot)
                 await bot.session.close()
             await close_database()
             logger.info("Cleanup completed")
@@ -237,7 +370,10 @@ async def main():
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        if uvloop is not None:
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         logger.info("Application stopped by user")
     except Exception as e:
@@ -2,16 +2,27 @@
 Middleware for bot
 """
 
+import asyncio
 import logging
-from typing import Callable, Dict, Any, Awaitable
+import asyncpg
+from typing import Callable, Dict, Any, Awaitable, Optional
 from aiogram import BaseMiddleware
+from aiogram.dispatcher.flags import get_flag
 from aiogram.types import Message
 
+from database.models import User
 from database.repositories.user_repo import UserRepository
 from database.connection import get_db_connection
+from shared.cache import LRUCache
 
 logger = logging.getLogger(__name__)
 
+# Кэш пользователей по Telegram ID: БД запрашивается не чаще раза в 5 минут на пользователя
+_user_cache = LRUCache(maxsize=100_000, ttl=300)
+
+# Блокировки по Telegram ID (первые одновременные апдейты не создают пользователя дважды)
+_user_locks: Dict[int, asyncio.Lock] = {}
+
 
 class AuthMiddleware(BaseMiddleware):
     """
@@ -25,34 +36,59 @@ class AuthMiddleware(BaseMiddleware):
         data: Dict[str, Any]
     ) -> Any:
         """
-        Check and create user if needed
+        Check and create user if needed (cached in process for 5 minutes)
         """
         user = event.from_user
         
         if user is None:
             return await handler(event, data)
+        
+        # Обработчикам с флагом skip_user не нужен db_user (данные берутся из FSM) -
+        # для них пользователь не загружается
+        if get_flag(data, "skip_user"):
+            return await handler(event, data)
 
+        db_user = _user_cache.get(user.id)
+        
+        if db_user is None:
+            lock = _user_locks.setdefault(user.id, asyncio.Lock())
+            try:
+                async with lock:
+                    # Пока ждали блокировку, пользователя мог загрузить другой апдейт
+                    db_user = _user_cache.get(user.id)
+                    if db_user is None:
+                        db_user = await self._get_or_create_user(user)
+                        if db_user is not None:
+                            _user_cache.set(user.id, db_user)
+            finally:
+                if not lock.locked():
+                    _user_locks.pop(user.id, None)
+        
+        if db_user is not None:
+            # Add user to data context
+            data["db_user"] = db_user
+        
+        return await handler(event, data)
+    
+    @staticmethod
+    async def _get_or_create_user(user) -> Optional[User]:
+        """
+        Load user from database, creating it on first contact (one upsert query)
+        
+        Returns:
+            User object or None on database error
+        """
         try:
             async with get_db_connection() as conn:
-                user_repo = UserRepository(conn)
-                
-                # Check if user exists
-                db_user = await user_repo.get_by_telegram_id(user.id)
+                return await UserRepository(conn).upsert(
+                    telegram_user_id=user.id,
+                    username=user.username,
+                    first_name=user.first_name,
+                    last_name=user.last_name
+                )
                 
-                # Create user if doesn't exist
-                if db_user is None:
-                    db_user = await user_repo.create(
-                        telegram_user_id=user.id,
-                        username=user.username,
-                        first_name=user.first_name,
-                        last_name=user.last_name
-                    )
-                    logger.info(f"New user created: {user.id}")
-                
-                # Add user to data context
-                data["db_user"] = db_user
-                
-        except Exception as e:
-            logger.error(f"Error in AuthMiddleware: {e}")
-        
-        return await handler(event, data)
+        except (asyncpg.PostgresError, asyncpg.InterfaceError, OSError, asyncio.TimeoutError) as e:
+            # Недоступность БД не должна ронять обработку апдейта;
+            # остальные ошибки (баги) не глушим
+            logger.error("Error in AuthMiddleware: %s", e)
+            return None
@@ -0,0 +1,67 @@
+"""
+Helpers for bot handlers
+"""
+
+import asyncio
+from typing import Any, Awaitable, Optional
+from aiogram.types import Message
+
+from telegram_bot.config import BotMessages
+
+# Через сколько секунд показывать "⏳ Обрабатываю..."
+PROCESSING_DELAY = 0.5
+
+
+class ProcessingReply:
+    """
+    Reply to a message that requires processing
+
+    The PROCESSING placeholder is sent only if the work takes longer
+    than `delay` seconds, and the final text is then edited into it.
+    Fast results are sent as a single message (one Bot API call
+    instead of send + edit).
+    """
+
+    def __init__(
+        self,
+        message: Message,
+        placeholder: str = BotMessages.PROCESSING,
+        delay: float = PROCESSING_DELAY
+    ):
+        self.message = message
+        self.placeholder = placeholder
+        self.delay = delay
+        self.placeholder_msg: Optional[Message] = None
+
+    async def run(self, awaitable: Awaitable[Any]) -> Any:
+        """
+        Await processing step, showing placeholder if it is slow
+
+        Args:
+            awaitable: Processing coroutine
+
+        Returns:
+            Result of the coroutine
+        """
+        task = asyncio.ensure_future(awaitable)
+
+        if self.placeholder_msg is None:
+            done, _ = await asyncio.wait({task}, timeout=self.delay)
+
+            if not done:
+                try:
+                    self.placeholder_msg = await self.message.answer(self.placeholder)
+                except Exception:
+                    task.cancel()
+                    raise
+
+        return await task
+
+    async def answer(self, text: str, **kwargs) -> Any:
+        """
+        Send final text (replaces placeholder if it was shown)
+        """
+        if self.placeholder_msg is not None:
+            return await self.placeholder_msg.edit_text(text, **kwargs)
+
+        return await self.message.answer(text, **kwargs)
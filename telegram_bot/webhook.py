@@ -2,11 +2,14 @@
 Webhook setup for bot
 """
 
+import asyncio
 import logging
 from aiohttp import web
 from aiogram import Bot, Dispatcher
 from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
 
+from shared.config import settings
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,6 +25,29 @@ async def on_shutdown(bot: Bot):
     logger.info("Webhook deleted")
 
 
+async def wait_background_updates(webhook_handler: SimpleRequestHandler, timeout: float) -> None:
+    """
+    Wait for updates that were already answered with 200 but are still being handled
+    
+    Args:
+        webhook_handler: Registered webhook handler
+        timeout: Max seconds to wait; handlers still running after that are cancelled
+    """
+    # Private set of aiogram 3.15 (BaseRequestHandler) - check on aiogram upgrade
+    tasks = set(webhook_handler._background_feed_update_tasks)
+    if not tasks:
+        return
+    
+    logger.info(f"Waiting for {len(tasks)} in-flight update(s)...")
+    _, pending = await asyncio.wait(tasks, timeout=timeout)
+    
+    if pending:
+        logger.warning(f"Cancelling {len(pending)} update(s) still running after {timeout}s")
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
 def setup_webhook_app(bot: Bot, dp: Dispatcher, webhook_path: str) -> web.Application:
     """
     Setup webhook application
@@ -37,10 +63,20 @@ def setup_webhook_app(bot: Bot, dp: Dispatcher, webhook_path: str) -> web.Applic
     app = web.Application()
     
     # Setup webhook handler
+    # Отвечаем Telegram 200 сразу, обработка апдейта идёт в фоне
+    # (тело запроса разбирается через bot.session.json_loads - orjson)
     webhook_handler = SimpleRequestHandler(
         dispatcher=dp,
-        bot=bot
+        bot=bot,
+        handle_in_background=True
     )
+    
+    # Before register(): on_shutdown hooks run in order, and the handler's own
+    # hook closes the bot session that in-flight handlers still need
+    async def drain_updates(app: web.Application):
+        await wait_background_updates(webhook_handler, settings.SHUTDOWN_TIMEOUT)
+    
+    app.on_shutdown.append(drain_updates)
     webhook_handler.register(app, path=webhook_path)
     
     # Setup application